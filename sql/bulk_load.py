@@ -0,0 +1,72 @@
+import os
+import threading
+
+
+def copy_between(source_cur, target_cur, copy_out_sql, copy_in_sql):
+    """Stream rows from one connection into another through COPY.
+
+    A background thread writes the source COPY ... TO STDOUT into a pipe that
+    the target COPY ... FROM STDIN reads from, so the rows never pile up in
+    client memory. Returns the number of rows copied in. An error on the
+    source side is raised after the target COPY, so the caller can roll the
+    target transaction back before committing a partial load.
+    """
+    read_fd, write_fd = os.pipe()
+    errors = []
+
+    def copy_out():
+        try:
+            with os.fdopen(write_fd, "wb") as pipe_out:
+                source_cur.copy_expert(copy_out_sql, pipe_out)
+        except Exception as e:
+            errors.append(e)
+
+    producer = threading.Thread(target=copy_out)
+    producer.start()
+    try:
+        # Closing the read end unblocks the producer if the target COPY fails
+        with os.fdopen(read_fd, "rb") as pipe_in:
+            target_cur.copy_expert(copy_in_sql, pipe_in)
+    finally:
+        producer.join()
+
+    if errors:
+        raise errors[0]
+    return target_cur.rowcount
+
+
+def drop_secondary_indexes(cursor, table_name):
+    """Drop the indexes of a table that do not back a constraint.
+
+    Returns the index definitions so they can be rebuilt once the bulk load is
+    done. Primary key and unique constraint indexes are kept, since the load
+    relies on them to reject duplicates.
+    """
+    cursor.execute(
+        """
+        SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        WHERE i.indrelid = %s::regclass
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid
+          )
+        """,
+        (table_name,),
+    )
+    index_definitions = cursor.fetchall()
+
+    for index_name, _ in index_definitions:
+        cursor.execute(f"DROP INDEX {index_name}")
+
+    return [definition for _, definition in index_definitions]
+
+
+def rebuild_indexes(cursor, index_definitions):
+    """Recreate indexes from the definitions returned by drop_secondary_indexes"""
+    for definition in index_definitions:
+        cursor.execute(definition)
+
+
+def analyze_table(cursor, table_name):
+    """Refresh planner statistics after a bulk load"""
+    cursor.execute(f"ANALYZE {table_name}")
@@ -0,0 +1,8 @@
+#!/bin/bash
+
+source ../../.env
+
+
+uv run ../provision.py cdc
+
+uv run ./cdc_sync.py
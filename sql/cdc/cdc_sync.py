@@ -0,0 +1,685 @@
+import logging
+import os
+import re
+import select
+import sys
+import time
+from datetime import datetime, timezone
+
+import psycopg2
+from dotenv import load_dotenv
+from psycopg2.errors import UndefinedObject
+from psycopg2.extensions import ISOLATION_LEVEL_REPEATABLE_READ
+from psycopg2.extras import LogicalReplicationConnection
+
+# Shared helpers live one level up, in sql/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from supplier_shards import get_tracked_columns  # noqa: E402
+from sync_locks import acquire_cdc_lock  # noqa: E402
+
+
+def setup_logging():
+    """Configure logging with file and stream handlers"""
+    logger = logging.getLogger(__name__)
+
+    # Clear any existing handlers
+    logger.handlers = []
+
+    # Set base logging level
+    logger.setLevel(logging.DEBUG)
+
+    # Create formatters
+    detailed_formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
+    )
+    console_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+
+    # File handler setup (detailed logging)
+    fh = logging.FileHandler("cdc_sync.log")
+    fh.setLevel(logging.DEBUG)
+    fh.setFormatter(detailed_formatter)
+    logger.addHandler(fh)
+
+    # Stream handler setup (less detailed for console)
+    sh = logging.StreamHandler()
+    sh.setLevel(logging.INFO)
+    sh.setFormatter(console_formatter)
+    logger.addHandler(sh)
+
+    return logger
+
+
+logger = setup_logging()
+
+
+# Source tables replicated as plain upserts/deletes: target table, key column
+# and the source -> target column mapping
+UPSERT_TABLES = {
+    "products": {
+        "target": "target_products",
+        "key": "product_id",
+        "columns": {
+            "product_id": "product_id",
+            "product_name": "product_name",
+            "category_id": "category_id",
+            "quantity_per_unit": "quantity_per_unit",
+            "unit_price": "unit_price",
+            "units_in_stock": "units_in_stock",
+            "units_on_order": "units_in_order",
+            "discontinued": "discontinued",
+        },
+    },
+    "employees": {
+        "target": "target_employees",
+        "key": "employee_id",
+        "columns": {
+            "employee_id": "employee_id",
+            "last_name": "last_name",
+            "first_name": "first_name",
+            "title": "title",
+            "address": "address",
+            "city": "city",
+            "postal_code": "postal_code",
+            "country": "country",
+            "reports_to": "reports_to",
+        },
+        # Loaded with the reference cleared first, like the task 02 full load
+        "self_reference": "reports_to",
+    },
+}
+
+# Columns of supplier_dimension, which is versioned with SCD Type 2
+SUPPLIER_COLUMNS = [
+    "supplier_id",
+    "company_name",
+    "contact_name",
+    "contact_title",
+    "address",
+    "city",
+    "region",
+    "postal_code",
+    "country",
+    "phone",
+    "fax",
+    "homepage",
+]
+
+# Every source table the stream applies; changes to other tables are ignored
+REPLICATED_TABLES = set(UPSERT_TABLES) | {"suppliers"}
+
+INTEGER_TYPES = {"smallint", "integer", "bigint"}
+
+# Identifiers are printed bare, or double-quoted when they need quoting
+IDENTIFIER = r'(?:"(?:[^"]|"")*"|[^\s."]+)'
+CHANGE_PATTERN = re.compile(rf"^table ({IDENTIFIER})\.({IDENTIFIER}): (\w+):\s?(.*)$")
+COLUMN_PATTERN = re.compile(r"(\w+)\[([^\]]+)\]:('(?:[^']|'')*'|\S+)")
+
+
+def get_db_config(db_name):
+    """Get database configuration based on database name"""
+    if db_name == "source_db":
+        return {
+            "database": os.getenv("POSTGRES_DB_SOURCE"),
+            "host": os.getenv("POSTGRES_SOURCE_HOST"),
+            "user": os.getenv("POSTGRES_USER_SOURCE"),
+            "password": os.getenv("POSTGRES_PASS_SOURCE"),
+            "port": os.getenv("POSTGRES_SOURCE_PORT"),
+        }
+    elif db_name == "target_db":
+        return {
+            "database": os.getenv("POSTGRES_DB_ANALYTICS"),
+            "host": os.getenv("POSTGRES_ANALYTICS_HOST"),
+            "user": os.getenv("POSTGRES_USER_ANALYTICS"),
+            "password": os.getenv("POSTGRES_PASSWORD_ANALYTICS"),
+            "port": os.getenv("POSTGRES_ANALYTICS_PORT"),
+        }
+
+
+def get_db_connection(db_name, **kwargs):
+    """Create database connection based on database name"""
+    config = get_db_config(db_name)
+    try:
+        conn = psycopg2.connect(**config, **kwargs)
+        logger.info(f"Successfully connected to database: {db_name}")
+        return conn
+    except Exception as e:
+        logger.error(f"Failed to connect to database {db_name}: {str(e)}")
+        raise
+
+
+def get_cdc_config():
+    """Get replication slot and micro-batch settings"""
+    return {
+        "slot_name": os.getenv("CDC_SLOT_NAME", "northwind_cdc"),
+        "batch_size": int(os.getenv("CDC_BATCH_SIZE", "500")),
+        "batch_seconds": float(os.getenv("CDC_BATCH_SECONDS", "1")),
+    }
+
+
+def lsn_to_int(lsn):
+    """Convert a textual pg_lsn such as '0/16B3748' to an integer"""
+    high, low = lsn.split("/")
+    return (int(high, 16) << 32) + int(low, 16)
+
+
+def int_to_lsn(value):
+    """Convert an integer LSN back to its textual pg_lsn form"""
+    return f"{value >> 32:X}/{value & 0xFFFFFFFF:X}"
+
+
+def parse_value(type_name, raw):
+    """Convert a test_decoding column value to a Python value"""
+    if raw == "null":
+        return None
+    if raw.startswith("'"):
+        return raw[1:-1].replace("''", "'")
+    if type_name in INTEGER_TYPES:
+        return int(raw)
+    if type_name == "boolean":
+        return raw == "true"
+    return raw
+
+
+def parse_columns(data):
+    """Parse 'name[type]:value' pairs, leaving out unchanged TOAST values"""
+    return {
+        name: parse_value(type_name, raw)
+        for name, type_name, raw in COLUMN_PATTERN.findall(data)
+        if raw != "unchanged-toast-datum"
+    }
+
+
+def unquote_identifier(identifier):
+    """Strip the double quotes test_decoding puts around some identifiers"""
+    if identifier.startswith('"'):
+        return identifier[1:-1].replace('""', '"')
+    return identifier
+
+
+def parse_change(payload):
+    """Parse a test_decoding change line into (table, operation, columns, old_key).
+
+    Returns None for any line that is not a change of a replicated table,
+    such as changes of other tables or pg_logical_emit_message output. A
+    TRUNCATE has no columns. old_key holds the previous key columns of an
+    update that changed the key, and is None otherwise.
+    """
+    match = CHANGE_PATTERN.match(payload)
+    if not match:
+        return None
+
+    schema, table, operation, data = match.groups()
+    schema = unquote_identifier(schema)
+    table = unquote_identifier(table)
+    if schema != "public" or table not in REPLICATED_TABLES:
+        return None
+
+    if operation == "TRUNCATE":
+        return table, operation, {}, None
+    if operation not in ("INSERT", "UPDATE", "DELETE"):
+        raise ValueError(f"Unexpected test_decoding message: {payload}")
+
+    old_key = None
+    if data.startswith("old-key:"):
+        old_data, data = data[len("old-key:") :].split("new-tuple:", 1)
+        old_key = parse_columns(old_data)
+    return table, operation, parse_columns(data), old_key
+
+
+def check_target_tables(cursor):
+    """Fail early when a target table the stream writes to does not exist"""
+    tables = [spec["target"] for spec in UPSERT_TABLES.values()]
+    tables += ["supplier_dimension", "cdc_checkpoint"]
+
+    missing = []
+    for table in tables:
+        cursor.execute("SELECT to_regclass(%s) IS NULL", (table,))
+        if cursor.fetchone()[0]:
+            missing.append(table)
+
+    if missing:
+        raise RuntimeError(
+            f"Missing target tables: {', '.join(missing)}. Run sql/task_02/task_02.sh "
+            f"and sql/task_04/task_04.sh once before sql/cdc/cdc.sh"
+        )
+
+
+def get_checkpoint(cursor, slot_name):
+    """Get the last LSN applied to the target for a slot, or None"""
+    cursor.execute(
+        "SELECT confirmed_lsn FROM cdc_checkpoint WHERE slot_name = %s", (slot_name,)
+    )
+    row = cursor.fetchone()
+    return lsn_to_int(row[0]) if row else None
+
+
+def save_checkpoint(cursor, slot_name, lsn, modified_by):
+    """Persist the last applied LSN in the same transaction as the changes"""
+    cursor.execute(
+        """
+        INSERT INTO cdc_checkpoint (slot_name, confirmed_lsn, modified_by)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (slot_name) DO UPDATE
+        SET confirmed_lsn = EXCLUDED.confirmed_lsn,
+            modified_by = EXCLUDED.modified_by,
+            modified_at = CURRENT_TIMESTAMP
+        """,
+        (slot_name, int_to_lsn(lsn), modified_by),
+    )
+
+
+def recreate_replication_slot(repl_cur, slot_name):
+    """Create the slot afresh, returning its consistent point and snapshot.
+
+    The exported snapshot shows the source exactly as of the consistent
+    point, and stays usable until the replication connection runs its next
+    command.
+    """
+    try:
+        repl_cur.drop_replication_slot(slot_name)
+        logger.info(f"Dropped replication slot {slot_name} without a checkpoint")
+    except UndefinedObject:
+        pass
+
+    repl_cur.create_replication_slot(slot_name, output_plugin="test_decoding")
+    _, consistent_point, snapshot_name, _ = repl_cur.fetchone()
+    logger.info(
+        f"Created replication slot {slot_name} at LSN {consistent_point} "
+        f"with snapshot {snapshot_name}"
+    )
+    return lsn_to_int(consistent_point), snapshot_name
+
+
+def apply_upsert(cursor, table, operation, columns, old_key, modified_by):
+    """Apply a products/employees change to its target table"""
+    spec = UPSERT_TABLES[table]
+    key_column = spec["key"]
+
+    if operation == "TRUNCATE":
+        logger.info(f"{table} truncated on the source, truncating {spec['target']}")
+        cursor.execute(f"TRUNCATE TABLE {spec['target']}")
+        return
+
+    # An update that changed the key removes the row stored under the old one
+    if old_key and old_key[key_column] != columns[key_column]:
+        logger.debug(
+            f"{table} key changed from {old_key[key_column]} to {columns[key_column]}"
+        )
+        cursor.execute(
+            f"DELETE FROM {spec['target']} WHERE {key_column} = %s",
+            (old_key[key_column],),
+        )
+
+    if operation == "DELETE":
+        cursor.execute(
+            f"DELETE FROM {spec['target']} WHERE {key_column} = %s",
+            (columns[key_column],),
+        )
+        return
+
+    mapped = {
+        spec["columns"][name]: value
+        for name, value in columns.items()
+        if name in spec["columns"]
+    }
+    target_columns = list(mapped)
+    assignments = ", ".join(
+        f"{column} = EXCLUDED.{column}"
+        for column in target_columns
+        if column != key_column
+    )
+    cursor.execute(
+        f"""
+        INSERT INTO {spec["target"]} (
+            {", ".join(target_columns)}, created_by, modified_by
+        ) VALUES ({", ".join(["%s"] * len(target_columns))}, %s, %s)
+        ON CONFLICT ({key_column}) DO UPDATE
+        SET {assignments},
+            modified_by = EXCLUDED.modified_by,
+            modified_at = CURRENT_TIMESTAMP
+        """,
+        (*mapped.values(), modified_by, modified_by),
+    )
+
+
+def expire_supplier(cursor, supplier_id, current_timestamp, modified_by):
+    """Close the current version of a supplier"""
+    cursor.execute(
+        """
+        UPDATE supplier_dimension
+        SET end_date = %s,
+            is_current = false,
+            modified_by = %s,
+            modified_at = %s
+        WHERE supplier_id = %s AND is_current = true
+        """,
+        (current_timestamp, modified_by, current_timestamp, supplier_id),
+    )
+
+
+def apply_supplier_change(
+    cursor, operation, columns, old_key, current_timestamp, modified_by
+):
+    """Apply a suppliers change to supplier_dimension using SCD Type 2"""
+    if operation == "TRUNCATE":
+        logger.info("suppliers truncated on the source, expiring all current records")
+        cursor.execute(
+            """
+            UPDATE supplier_dimension
+            SET end_date = %s,
+                is_current = false,
+                modified_by = %s,
+                modified_at = %s
+            WHERE is_current = true
+            """,
+            (current_timestamp, modified_by, current_timestamp),
+        )
+        return
+
+    supplier_id = columns["supplier_id"]
+
+    # An update that changed the key closes the version of the old supplier_id
+    if old_key and old_key["supplier_id"] != supplier_id:
+        logger.debug(
+            f"Supplier key changed from {old_key['supplier_id']} to {supplier_id}, "
+            f"expiring old current record"
+        )
+        expire_supplier(cursor, old_key["supplier_id"], current_timestamp, modified_by)
+
+    if operation == "DELETE":
+        logger.debug(f"Supplier {supplier_id} deleted, expiring current record")
+        expire_supplier(cursor, supplier_id, current_timestamp, modified_by)
+        return
+
+    cursor.execute(
+        f"""
+        SELECT {", ".join(SUPPLIER_COLUMNS)}
+        FROM supplier_dimension
+        WHERE supplier_id = %s AND is_current = true
+        """,
+        (supplier_id,),
+    )
+    row = cursor.fetchone()
+    current = dict(zip(SUPPLIER_COLUMNS, row)) if row else {}
+
+    if current and all(
+        columns.get(column, current[column]) == current[column]
+        for column in get_tracked_columns()
+    ):
+        logger.debug(f"No changes detected for supplier_id: {supplier_id}")
+        return
+
+    if current:
+        logger.debug(f"Changes detected for supplier_id: {supplier_id}")
+        expire_supplier(cursor, supplier_id, current_timestamp, modified_by)
+
+    # Columns left out of the change (unchanged TOAST values) keep their value
+    new_version = {**current, **columns}
+    cursor.execute(
+        f"""
+        INSERT INTO supplier_dimension (
+            {", ".join(SUPPLIER_COLUMNS)}, effective_date, end_date,
+            is_current, created_by, modified_by
+        ) VALUES (
+            {", ".join(["%s"] * len(SUPPLIER_COLUMNS))}, %s, NULL, true, %s, %s
+        )
+        """,
+        (
+            *(new_version.get(column) for column in SUPPLIER_COLUMNS),
+            current_timestamp,
+            modified_by,
+            modified_by,
+        ),
+    )
+
+
+def get_source_rows(cursor, table, columns):
+    """Get every row of a source table as column -> value dicts"""
+    cursor.execute(f"SELECT {', '.join(columns)} FROM {table}")
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def load_snapshot(source_conn, target_conn, snapshot_name, lsn, config, modified_by):
+    """Reconcile the target with the source as of an exported slot snapshot.
+
+    Rows are applied through the same upsert and SCD Type 2 paths as the
+    stream, and target rows missing from the snapshot are deleted or expired.
+    The slot's consistent point is saved as the checkpoint in the same target
+    transaction, so streaming starts exactly where the snapshot ends.
+    """
+    current_timestamp = datetime.now(timezone.utc)
+    source_conn.set_session(
+        isolation_level=ISOLATION_LEVEL_REPEATABLE_READ, readonly=True
+    )
+
+    try:
+        with source_conn.cursor() as source_cur, target_conn.cursor() as cur:
+            source_cur.execute("SET TRANSACTION SNAPSHOT %s", (snapshot_name,))
+
+            for table, spec in UPSERT_TABLES.items():
+                key_column = spec["key"]
+                rows = get_source_rows(source_cur, table, list(spec["columns"]))
+
+                self_reference = spec.get("self_reference")
+                if self_reference:
+                    for row in rows:
+                        apply_upsert(
+                            cur,
+                            table,
+                            "INSERT",
+                            {**row, self_reference: None},
+                            None,
+                            modified_by,
+                        )
+                for row in rows:
+                    apply_upsert(cur, table, "INSERT", row, None, modified_by)
+
+                cur.execute(
+                    f"DELETE FROM {spec['target']} WHERE NOT {key_column} = ANY(%s)",
+                    ([row[key_column] for row in rows],),
+                )
+                logger.info(
+                    f"Loaded {len(rows)} {table} from the snapshot, "
+                    f"deleted {cur.rowcount} rows missing from it"
+                )
+
+            rows = get_source_rows(source_cur, "suppliers", SUPPLIER_COLUMNS)
+            for row in rows:
+                apply_supplier_change(
+                    cur, "INSERT", row, None, current_timestamp, modified_by
+                )
+            cur.execute(
+                """
+                UPDATE supplier_dimension
+                SET end_date = %s,
+                    is_current = false,
+                    modified_by = %s,
+                    modified_at = %s
+                WHERE is_current = true AND NOT supplier_id = ANY(%s)
+                """,
+                (
+                    current_timestamp,
+                    modified_by,
+                    current_timestamp,
+                    [row["supplier_id"] for row in rows],
+                ),
+            )
+            logger.info(
+                f"Loaded {len(rows)} suppliers from the snapshot, "
+                f"expired {cur.rowcount} missing from it"
+            )
+
+            save_checkpoint(cur, config["slot_name"], lsn, modified_by)
+
+        target_conn.commit()
+        source_conn.rollback()
+
+    except Exception as e:
+        logger.error(f"Error loading the slot snapshot: {str(e)}", exc_info=True)
+        target_conn.rollback()
+        source_conn.rollback()
+        raise
+
+
+def apply_batch(target_conn, changes, lsn, config, modified_by):
+    """Apply a micro-batch of committed changes and its checkpoint atomically"""
+    current_timestamp = datetime.now(timezone.utc)
+
+    try:
+        with target_conn.cursor() as cur:
+            for table, operation, columns, old_key in changes:
+                if table == "suppliers":
+                    apply_supplier_change(
+                        cur, operation, columns, old_key, current_timestamp, modified_by
+                    )
+                else:
+                    apply_upsert(cur, table, operation, columns, old_key, modified_by)
+
+            save_checkpoint(cur, config["slot_name"], lsn, modified_by)
+
+        target_conn.commit()
+        logger.info(f"Applied {len(changes)} changes up to LSN {int_to_lsn(lsn)}")
+
+    except Exception as e:
+        logger.error(f"Error applying CDC batch: {str(e)}", exc_info=True)
+        target_conn.rollback()
+        raise
+
+
+def stream_changes(repl_cur, target_conn, checkpoint, config, modified_by):
+    """Consume the replication stream and apply it in micro-batches.
+
+    Changes are buffered per source transaction and only added to the batch
+    on COMMIT, so a batch always holds whole transactions. Transactions that
+    committed at or before the checkpoint were already applied and are
+    skipped, which makes restarts exactly-once.
+    """
+    transaction = []
+    batch = []
+    batch_lsn = checkpoint
+    batch_started = None
+
+    while True:
+        msg = repl_cur.read_message()
+
+        if msg is not None:
+            payload = msg.payload
+            if payload.startswith("BEGIN"):
+                transaction = []
+            elif payload.startswith("COMMIT"):
+                if msg.data_start > checkpoint:
+                    batch.extend(transaction)
+                    batch_lsn = msg.data_start
+                    if batch_started is None:
+                        batch_started = time.monotonic()
+                transaction = []
+            else:
+                change = parse_change(payload)
+                if change:
+                    transaction.append(change)
+
+        batch_due = batch_started is not None and (
+            len(batch) >= config["batch_size"]
+            or time.monotonic() - batch_started >= config["batch_seconds"]
+        )
+        if batch_due:
+            apply_batch(target_conn, batch, batch_lsn, config, modified_by)
+            # Only confirm to the source once the target has committed
+            repl_cur.send_feedback(flush_lsn=batch_lsn)
+            checkpoint = batch_lsn
+            batch = []
+            batch_started = None
+            continue
+
+        if msg is None:
+            timeout = config["batch_seconds"]
+            if batch_started is not None:
+                timeout = max(0, batch_started + timeout - time.monotonic())
+            select.select([repl_cur], [], [], timeout)
+
+
+def run_cdc(repl_conn, target_conn, modified_by):
+    """Bootstrap or resume the slot and stream changes.
+
+    Without a checkpoint, for example on the first run or after a full load,
+    the slot is recreated and the target is loaded from its snapshot first.
+    """
+    config = get_cdc_config()
+
+    # Held until the connection closes, so no full load runs while streaming
+    acquire_cdc_lock(target_conn)
+
+    with target_conn.cursor() as target_cur:
+        check_target_tables(target_cur)
+        checkpoint = get_checkpoint(target_cur, config["slot_name"])
+    target_conn.commit()
+
+    with repl_conn.cursor() as repl_cur:
+        if checkpoint is None:
+            logger.info(f"No checkpoint for slot {config['slot_name']}, bootstrapping")
+            checkpoint, snapshot_name = recreate_replication_slot(
+                repl_cur, config["slot_name"]
+            )
+            source_conn = get_db_connection("source_db")
+            try:
+                load_snapshot(
+                    source_conn,
+                    target_conn,
+                    snapshot_name,
+                    checkpoint,
+                    config,
+                    modified_by,
+                )
+            finally:
+                source_conn.close()
+
+        logger.info(
+            f"Streaming slot {config['slot_name']} from LSN {int_to_lsn(checkpoint)}"
+        )
+        repl_cur.start_replication(
+            slot_name=config["slot_name"],
+            decode=True,
+            start_lsn=checkpoint,
+            options={"include-xids": "0", "skip-empty-xacts": "1"},
+        )
+        stream_changes(repl_cur, target_conn, checkpoint, config, modified_by)
+
+
+def main():
+    """Main function to run the change-data-capture sync"""
+    load_dotenv()
+    modified_by = "SYSTEM"
+
+    logger.info("=== Starting CDC Sync Process ===")
+    repl_conn = None
+    target_conn = None
+
+    try:
+        repl_conn = get_db_connection(
+            "source_db", connection_factory=LogicalReplicationConnection
+        )
+        target_conn = get_db_connection("target_db")
+
+        run_cdc(repl_conn, target_conn, modified_by)
+
+    except KeyboardInterrupt:
+        logger.info("CDC sync stopped")
+
+    except Exception as e:
+        logger.error(f"CDC sync failed: {str(e)}", exc_info=True)
+        raise
+
+    finally:
+        logger.info("Closing database connections")
+        for conn in [repl_conn, target_conn]:
+            if conn:
+                conn.close()
+                logger.debug("Database connection closed")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        logging.error(f"Application failed: {str(e)}")
+        sys.exit(1)
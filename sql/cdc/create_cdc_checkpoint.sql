@@ -0,0 +1,8 @@
+-- Last source LSN applied to the target by the CDC sync, one row per slot.
+-- Not dropped on provisioning, so a restart resumes where the sync stopped.
+CREATE TABLE IF NOT EXISTS cdc_checkpoint (
+    slot_name VARCHAR(63) PRIMARY KEY,
+    confirmed_lsn PG_LSN NOT NULL,
+    modified_by VARCHAR(50) NOT NULL,
+    modified_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,157 @@
+import logging
+import os
+import sys
+
+import psycopg2
+from dotenv import load_dotenv
+from sync_locks import acquire_full_load_lock
+
+
+def setup_logging():
+    """Configure logging with file and stream handlers"""
+    logger = logging.getLogger(__name__)
+
+    # Clear any existing handlers
+    logger.handlers = []
+
+    # Set base logging level
+    logger.setLevel(logging.DEBUG)
+
+    # Create formatters
+    detailed_formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
+    )
+    console_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+
+    # File handler setup (detailed logging)
+    fh = logging.FileHandler("provision.log")
+    fh.setLevel(logging.DEBUG)
+    fh.setFormatter(detailed_formatter)
+    logger.addHandler(fh)
+
+    # Stream handler setup (less detailed for console)
+    sh = logging.StreamHandler()
+    sh.setLevel(logging.INFO)
+    sh.setFormatter(console_formatter)
+    logger.addHandler(sh)
+
+    return logger
+
+
+logger = setup_logging()
+
+
+SQL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# DDL files of each task, in the order they must be applied to the target
+TASK_DDL_FILES = {
+    "task_02": [
+        "create_audit_table.sql",
+        "create_target_products.sql",
+        "create_target_employees.sql",
+    ],
+    "task_03": ["task_03_schema_ddl.sql"],
+    "task_04": ["create_supplier_dim.sql"],
+    "task_05": ["create_imported_supplier.sql"],
+    "cdc": ["create_cdc_checkpoint.sql"],
+}
+
+# Tasks whose DDL drops or reloads tables the CDC sync writes to
+FULL_LOAD_TASKS = {"task_02", "task_04"}
+
+
+def get_db_config(db_name):
+    """Get database configuration based on database name"""
+    if db_name == "source_db":
+        return {
+            "database": os.getenv("POSTGRES_DB_SOURCE"),
+            "host": os.getenv("POSTGRES_SOURCE_HOST"),
+            "user": os.getenv("POSTGRES_USER_SOURCE"),
+            "password": os.getenv("POSTGRES_PASS_SOURCE"),
+            "port": os.getenv("POSTGRES_SOURCE_PORT"),
+        }
+    elif db_name == "target_db":
+        return {
+            "database": os.getenv("POSTGRES_DB_ANALYTICS"),
+            "host": os.getenv("POSTGRES_ANALYTICS_HOST"),
+            "user": os.getenv("POSTGRES_USER_ANALYTICS"),
+            "password": os.getenv("POSTGRES_PASSWORD_ANALYTICS"),
+            "port": os.getenv("POSTGRES_ANALYTICS_PORT"),
+        }
+
+
+def get_db_connection(db_name):
+    """Create database connection based on database name"""
+    config = get_db_config(db_name)
+    try:
+        conn = psycopg2.connect(**config)
+        logger.info(f"Successfully connected to database: {db_name}")
+        return conn
+    except Exception as e:
+        logger.error(f"Failed to connect to database {db_name}: {str(e)}")
+        raise
+
+
+def run_sql_file(cursor, path):
+    """Execute every statement of a DDL file"""
+    with open(path, "r") as sql_file:
+        cursor.execute(sql_file.read())
+    logger.info(f"Applied {os.path.relpath(path, SQL_DIR)}")
+
+
+def provision_task(conn, task):
+    """Apply the DDL files of a task in a single transaction"""
+    if task not in TASK_DDL_FILES:
+        raise ValueError(
+            f"Unknown task: {task}. Expected one of {', '.join(TASK_DDL_FILES)}"
+        )
+
+    try:
+        with conn.cursor() as cur:
+            for file_name in TASK_DDL_FILES[task]:
+                run_sql_file(cur, os.path.join(SQL_DIR, task, file_name))
+        conn.commit()
+        logger.info(f"Provisioning of {task} completed")
+
+    except Exception as e:
+        logger.error(f"Error provisioning {task}: {str(e)}")
+        conn.rollback()
+        raise
+
+
+def main():
+    """Main function to provision the target tables of the given tasks"""
+    load_dotenv(os.path.join(SQL_DIR, "..", ".env"))
+
+    # Some DDL files drop their tables, so tasks must always be named explicitly
+    tasks = sys.argv[1:]
+    if not tasks:
+        raise ValueError(
+            f"Usage: provision.py TASK [TASK ...], where TASK is one of "
+            f"{', '.join(TASK_DDL_FILES)}"
+        )
+
+    conn = None
+    try:
+        conn = get_db_connection("target_db")
+        if FULL_LOAD_TASKS.intersection(tasks):
+            acquire_full_load_lock(conn)
+        for task in tasks:
+            provision_task(conn, task)
+
+    except Exception as e:
+        logger.error(f"Provisioning failed: {str(e)}")
+        raise
+
+    finally:
+        if conn:
+            conn.close()
+            logger.debug("Database connection closed")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        logger.error(f"Application failed: {str(e)}")
+        sys.exit(1)
@@ -0,0 +1,128 @@
+from array import array
+from bisect import bisect_left
+from itertools import chain
+
+# Stands in for NULL inside typed integer columns
+INT_NULL = -(2**63)
+
+# Rows fetched per round trip when a snapshot streams from a named cursor
+SNAPSHOT_ITERSIZE = 10000
+
+
+class CompactSnapshot:
+    """Read-only in-memory copy of a target table keyed by an integer id.
+
+    Rows are stored column by column instead of as one tuple per dict entry:
+    the keys go in a sorted array searched with bisect, the integer columns
+    named by the caller are appended straight into typed arrays, and every
+    other column is a plain list. Equal strings of the low-cardinality
+    columns named by the caller share a single object. Lookups return the
+    same tuple the old ``{row[0]: row[1:]}`` dicts held, so callers can use
+    it as a drop-in replacement for ``dict.get`` and ``in``.
+    """
+
+    __slots__ = ("_keys", "_columns", "_int_columns")
+
+    def __init__(self, keys, columns, int_columns):
+        self._keys = keys
+        self._columns = columns
+        self._int_columns = int_columns
+
+    @classmethod
+    def from_cursor(cls, cursor, int_columns=(), interned_columns=()):
+        """Build a snapshot while iterating a cursor, naming columns by name.
+
+        Works with named (server-side) cursors, which only expose their
+        description once the first row has been fetched.
+        """
+        rows = iter(cursor)
+        first = next(rows, None)
+        if first is None:
+            return cls.from_rows(())
+
+        names = [column[0] for column in cursor.description][1:]
+        return cls.from_rows(
+            chain([first], rows),
+            int_columns=[names.index(name) for name in int_columns],
+            interned_columns=[names.index(name) for name in interned_columns],
+        )
+
+    @classmethod
+    def from_rows(cls, rows, int_columns=(), interned_columns=()):
+        """Build a snapshot from rows whose first value is the integer key.
+
+        int_columns and interned_columns are positions among the non-key
+        values of a row.
+        """
+        int_columns = frozenset(int_columns)
+        keys = array("q")
+        columns = None
+        pools = {position: {} for position in interned_columns}
+        is_sorted = True
+
+        for row in rows:
+            key = row[0]
+            if columns is None:
+                columns = tuple(
+                    array("q") if position in int_columns else []
+                    for position in range(len(row) - 1)
+                )
+            elif key <= keys[-1]:
+                if key == keys[-1]:
+                    raise ValueError(f"Duplicate key in snapshot: {key}")
+                is_sorted = False
+            keys.append(key)
+
+            for position, column in enumerate(columns):
+                value = row[position + 1]
+                if position in int_columns:
+                    value = INT_NULL if value is None else value
+                elif value is not None and position in pools:
+                    value = pools[position].setdefault(value, value)
+                column.append(value)
+
+        if columns is None:
+            return cls(keys, (), int_columns)
+
+        if not is_sorted:
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            keys = array("q", (keys[i] for i in order))
+            columns = tuple(
+                array("q", (column[i] for i in order))
+                if isinstance(column, array)
+                else [column[i] for i in order]
+                for column in columns
+            )
+            for i in range(1, len(keys)):
+                if keys[i] == keys[i - 1]:
+                    raise ValueError(f"Duplicate key in snapshot: {keys[i]}")
+
+        return cls(keys, columns, int_columns)
+
+    def _position(self, key):
+        """Return the index of key in the sorted key array, or -1"""
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return i
+        return -1
+
+    def get(self, key, default=None):
+        """Return the non-key values of a row as a tuple"""
+        i = self._position(key)
+        if i < 0:
+            return default
+        return tuple(
+            None
+            if position in self._int_columns and column[i] == INT_NULL
+            else column[i]
+            for position, column in enumerate(self._columns)
+        )
+
+    def __contains__(self, key):
+        return self._position(key) >= 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(self._keys)
@@ -0,0 +1,149 @@
+import gc
+import sys
+import tracemalloc
+from decimal import Decimal
+
+from snapshot import CompactSnapshot
+
+CITIES = ["London", "New Orleans", "Ann Arbor", "Tokyo", "Oviedo", "Osaka"]
+COUNTRIES = ["UK", "USA", "Japan", "Spain", "Australia", "Sweden"]
+
+# Columns of the generated rows, key first
+SUPPLIER_COLUMNS = [
+    "supplier_id",
+    "company_name",
+    "contact_name",
+    "contact_title",
+    "address",
+    "city",
+    "region",
+    "postal_code",
+    "country",
+    "phone",
+    "fax",
+    "homepage",
+]
+PRODUCT_COLUMNS = [
+    "product_id",
+    "category_id",
+    "quantity_per_unit",
+    "unit_price",
+    "units_in_stock",
+    "discontinued",
+]
+
+
+def fresh(value):
+    """Return a new copy of a string, as psycopg2 builds one per fetched value"""
+    return value.encode().decode()
+
+
+def generate_supplier_rows(row_count):
+    """Yield rows shaped like get_current_suppliers results"""
+    for supplier_id in range(1, row_count + 1):
+        yield (
+            supplier_id,
+            f"Company {supplier_id}",
+            f"Contact {supplier_id}",
+            fresh("Sales Representative"),
+            f"{supplier_id} Main Street",
+            fresh(CITIES[supplier_id % len(CITIES)]),
+            None,
+            f"{supplier_id % 100000:05d}",
+            fresh(COUNTRIES[supplier_id % len(COUNTRIES)]),
+            f"(555) {supplier_id % 10000000:07d}",
+            None,
+            None,
+        )
+
+
+def generate_product_rows(row_count):
+    """Yield rows shaped like target_products rows keyed by product_id"""
+    for product_id in range(1, row_count + 1):
+        yield (
+            product_id,
+            str(product_id % 8 + 1),
+            fresh("24 - 12 oz bottles"),
+            Decimal(f"{product_id % 100}.50"),
+            product_id % 1000,
+            product_id % 2,
+        )
+
+
+def snapshot_options(columns, int_columns=(), interned_columns=()):
+    """Translate column names into the positions CompactSnapshot.from_rows takes"""
+    names = columns[1:]
+    return {
+        "int_columns": [names.index(name) for name in int_columns],
+        "interned_columns": [names.index(name) for name in interned_columns],
+    }
+
+
+def measure(build):
+    """Return the bytes held by the structure build() returns and the build peak"""
+    gc.collect()
+    tracemalloc.start()
+    structure = build()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del structure
+    gc.collect()
+    return size, peak
+
+
+def format_size(label, size, row_count):
+    """Format a byte count as MiB and bytes per row"""
+    return f"{label} {size / 2**20:.0f} MiB ({size / row_count:.0f} B/row)"
+
+
+def main():
+    """Compare dict-of-tuples and CompactSnapshot memory at a given row count.
+
+    Rows are generated one at a time, like the named cursors the syncs stream
+    from, so the peak only counts the structure being built.
+    """
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+
+    # The supplier options are the ones get_current_suppliers passes in task 04
+    for name, generate_rows, options in [
+        (
+            "suppliers",
+            generate_supplier_rows,
+            snapshot_options(
+                SUPPLIER_COLUMNS,
+                interned_columns=["contact_title", "city", "region", "country"],
+            ),
+        ),
+        (
+            "products",
+            generate_product_rows,
+            snapshot_options(
+                PRODUCT_COLUMNS,
+                int_columns=["units_in_stock", "discontinued"],
+                interned_columns=["category_id", "quantity_per_unit"],
+            ),
+        ),
+    ]:
+        dict_size, dict_peak = measure(
+            lambda: {row[0]: row[1:] for row in generate_rows(row_count)}
+        )
+        snapshot_size, snapshot_peak = measure(
+            lambda: CompactSnapshot.from_rows(generate_rows(row_count), **options)
+        )
+        print(f"{name}: {row_count} rows")
+        print(
+            f"  dict:     {format_size('held', dict_size, row_count)}, "
+            f"{format_size('peak', dict_peak, row_count)}"
+        )
+        print(
+            f"  snapshot: {format_size('held', snapshot_size, row_count)}, "
+            f"{format_size('peak', snapshot_peak, row_count)}"
+        )
+        print(
+            f"  {1 - snapshot_size / dict_size:.0%} smaller held, "
+            f"{1 - snapshot_peak / dict_peak:.0%} smaller peak"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import os
+
+# Namespace for the supplier sync advisory locks (first key of the two-key form)
+SUPPLIER_SYNC_LOCK_NAMESPACE = 4004
+
+# Second key of the lock serializing the start of runs and their bucket layout
+SHARD_LAYOUT_LOCK = -1
+
+# supplier_id is a SMALLINT, so the buckets cover this whole domain
+SUPPLIER_ID_MIN = -32768
+SUPPLIER_ID_MAX = 32767
+
+
+def get_shard_count():
+    """Get the number of supplier_id buckets the sync is split into"""
+    shard_count = int(os.getenv("SUPPLIER_SYNC_SHARDS", "1"))
+    if shard_count < 1:
+        raise ValueError(f"SUPPLIER_SYNC_SHARDS must be >= 1, got {shard_count}")
+    return shard_count
+
+
+def get_tracked_columns():
+    """Return list of columns that need change tracking"""
+    return [
+        "contact_name",
+        "contact_title",
+        "address",
+        "city",
+        "region",
+        "postal_code",
+        "country",
+        "phone",
+    ]
+
+
+def compute_shard_ranges(boundaries):
+    """Turn bucket boundaries into contiguous (lower, upper) supplier_id ranges.
+
+    boundaries holds the lowest supplier_id of every bucket but the first.
+    The first and last bucket are open-ended so ids added during a run,
+    including negative ones, always fall into exactly one bucket. Buckets
+    whose boundary repeats the previous one hold no ids and have lower > upper.
+    """
+    starts = [SUPPLIER_ID_MIN, *boundaries, SUPPLIER_ID_MAX + 1]
+    return [(starts[i], starts[i + 1] - 1) for i in range(len(starts) - 1)]
+
+
+def get_shard_boundaries(source_cur, shard_count):
+    """Get supplier_id boundaries that give every bucket the same number of ids"""
+    source_cur.execute(
+        """
+        SELECT percentile_disc(%s::float8[]) WITHIN GROUP (ORDER BY supplier_id)
+        FROM suppliers
+        """,
+        ([i / shard_count for i in range(1, shard_count)],),
+    )
+    boundaries = source_cur.fetchone()[0]
+    if boundaries is None:
+        # No suppliers yet, so the first bucket takes the whole domain
+        boundaries = [SUPPLIER_ID_MAX + 1] * (shard_count - 1)
+    return boundaries
+
+
+def start_or_join_run(source_cur, target_conn, shard_count):
+    """Join the unfinished sync run, or start a new one, and return its run_id.
+
+    A new run lays out its buckets from the suppliers in use when it starts,
+    so the buckets are rebalanced on every run. Joining a run with a different
+    bucket count is refused, since the two layouts would overlap.
+    """
+    try:
+        with target_conn.cursor() as cur:
+            cur.execute(
+                "SELECT pg_advisory_xact_lock(%s, %s)",
+                (SUPPLIER_SYNC_LOCK_NAMESPACE, SHARD_LAYOUT_LOCK),
+            )
+            cur.execute("""
+                SELECT run_id, shard_count
+                FROM supplier_sync_run
+                WHERE finished_at IS NULL
+                ORDER BY run_id DESC
+                LIMIT 1
+            """)
+            row = cur.fetchone()
+
+            if row:
+                run_id, run_shard_count = row
+                if run_shard_count != shard_count:
+                    raise ValueError(
+                        f"SUPPLIER_SYNC_SHARDS is {shard_count} but run {run_id} is "
+                        f"still open with {run_shard_count} shards; finish it with "
+                        f"the same value first"
+                    )
+            else:
+                ranges = compute_shard_ranges(
+                    get_shard_boundaries(source_cur, shard_count)
+                )
+                cur.execute(
+                    """
+                    INSERT INTO supplier_sync_run (shard_count)
+                    VALUES (%s)
+                    RETURNING run_id
+                    """,
+                    (shard_count,),
+                )
+                run_id = cur.fetchone()[0]
+
+                # Buckets of finished runs are no longer needed
+                cur.execute(
+                    "DELETE FROM supplier_sync_shard WHERE run_id < %s", (run_id,)
+                )
+                for shard, (lower, upper) in enumerate(ranges):
+                    cur.execute(
+                        """
+                        INSERT INTO supplier_sync_shard (
+                            run_id, shard, lower_supplier_id, upper_supplier_id
+                        ) VALUES (%s, %s, %s, %s)
+                        """,
+                        (run_id, shard, lower, upper),
+                    )
+
+        target_conn.commit()
+        return run_id
+
+    except Exception:
+        target_conn.rollback()
+        raise
+
+
+def claim_next_shard(cursor, run_id):
+    """Claim a bucket of the run that no worker has synced or is syncing.
+
+    The row lock taken here is the claim, so it lasts until the current
+    target transaction ends and a crashed worker never leaves its bucket
+    claimed. Returns (shard, lower, upper), or None once every bucket is done.
+    """
+    cursor.execute(
+        """
+        SELECT shard, lower_supplier_id, upper_supplier_id
+        FROM supplier_sync_shard
+        WHERE run_id = %s AND synced_at IS NULL
+        ORDER BY shard
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+        """,
+        (run_id,),
+    )
+    return cursor.fetchone()
+
+
+def mark_shard_synced(cursor, run_id, shard):
+    """Record a bucket as synced, in the transaction that synced it"""
+    cursor.execute(
+        """
+        UPDATE supplier_sync_shard
+        SET synced_at = CURRENT_TIMESTAMP
+        WHERE run_id = %s AND shard = %s
+        """,
+        (run_id, shard),
+    )
+
+
+def finish_run(cursor, run_id):
+    """Close the run once all of its buckets are synced, returning whether it was"""
+    cursor.execute(
+        """
+        UPDATE supplier_sync_run
+        SET finished_at = CURRENT_TIMESTAMP
+        WHERE run_id = %s
+          AND finished_at IS NULL
+          AND NOT EXISTS (
+              SELECT 1
+              FROM supplier_sync_shard
+              WHERE run_id = %s AND synced_at IS NULL
+          )
+        """,
+        (run_id, run_id),
+    )
+    return cursor.rowcount == 1
@@ -0,0 +1,53 @@
+# Namespace and key of the advisory lock that keeps full loads and CDC apart.
+# Full loads hold it shared, so task 02 and task 04 workers can run together,
+# and the CDC sync holds it exclusively for as long as it streams
+SYNC_LOCK_NAMESPACE = 4006
+FULL_LOAD_LOCK = 0
+
+
+def acquire_full_load_lock(conn):
+    """Hold the full-load lock for the rest of the session, or fail.
+
+    Refuses to run while the CDC sync is streaming into the target. A full
+    load rewrites target tables outside of the replication stream, so the
+    CDC checkpoint is cleared and the next CDC start bootstraps again from a
+    fresh slot snapshot instead of replaying changes over the new data.
+    """
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT pg_try_advisory_lock_shared(%s, %s)",
+                (SYNC_LOCK_NAMESPACE, FULL_LOAD_LOCK),
+            )
+            if not cur.fetchone()[0]:
+                raise RuntimeError(
+                    "The CDC sync is running on the target; stop it before running "
+                    "a full load"
+                )
+
+            cur.execute("SELECT to_regclass('cdc_checkpoint') IS NOT NULL")
+            if cur.fetchone()[0]:
+                cur.execute("DELETE FROM cdc_checkpoint")
+
+        conn.commit()
+
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def acquire_cdc_lock(conn):
+    """Hold the full-load lock exclusively for the rest of the session, or fail"""
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT pg_try_advisory_lock(%s, %s)",
+            (SYNC_LOCK_NAMESPACE, FULL_LOAD_LOCK),
+        )
+        acquired = cur.fetchone()[0]
+    conn.commit()
+
+    if not acquired:
+        raise RuntimeError(
+            "A full load or another CDC sync is running on the target; wait for "
+            "it to finish before starting the CDC sync"
+        )
@@ -25,12 +25,14 @@ CREATE TABLE IF NOT EXISTS target_employees (
 );
 
 -- Indexes for better performance
-CREATE INDEX IF NOT EXISTS idx_target_employees_employee_id
-ON target_employees (employee_id);
-
+-- employee_id lookups are served by the index behind its UNIQUE constraint
 CREATE INDEX IF NOT EXISTS idx_target_employees_modified
 ON target_employees (modified_at);
 
+-- Supports the ON DELETE SET NULL check of the self-referencing foreign key
+CREATE INDEX IF NOT EXISTS idx_target_employees_reports_to
+ON target_employees (reports_to);
+
 -- Foreign key for reports_to (self-referencing)
 ALTER TABLE target_employees
 ADD CONSTRAINT fk_reports_to
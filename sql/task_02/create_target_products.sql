@@ -23,8 +23,6 @@ CREATE TABLE IF NOT EXISTS target_products (
 );
 
 -- Indexes for better performance
-CREATE INDEX IF NOT EXISTS idx_target_products_product_id
-ON target_products (product_id);
-
+-- product_id lookups are served by the index behind its UNIQUE constraint
 CREATE INDEX IF NOT EXISTS idx_target_products_modified
 ON target_products (modified_at);
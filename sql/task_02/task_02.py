@@ -5,6 +5,16 @@ import sys
 import psycopg2
 from dotenv import load_dotenv
 
+# Shared helpers live one level up, in sql/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bulk_load import (  # noqa: E402
+    analyze_table,
+    copy_between,
+    drop_secondary_indexes,
+    rebuild_indexes,
+)
+from sync_locks import acquire_full_load_lock  # noqa: E402
+
 
 def setup_logging():
     """Configure logging with file and stream handlers"""
@@ -74,65 +84,51 @@ def get_existing_products(cursor):
     return {row[0]: row[1:] for row in cursor.fetchall()}
 
 
-def get_source_products(cursor):
-    """Get products from source database"""
-    cursor.execute("""
-        SELECT 
-            product_id, product_name, category_id, 
-            quantity_per_unit, unit_price, units_in_stock,
-            units_on_order, discontinued
-        FROM products
-    """)
-    return cursor.fetchall()
-
-
-def insert_product(cursor, product, modified_by):
-    """Insert a single product into target database"""
-    insert_values = (
-        product[0],
-        product[1],
-        product[2],
-        product[3],
-        product[4],
-        product[5],
-        product[6],
-        product[7],
-        modified_by,
-        modified_by,
-    )
-
-    cursor.execute(
+def copy_source_products(source_cur, target_cur, modified_by):
+    """Stream every source product into target_products with COPY"""
+    copy_out_sql = source_cur.mogrify(
         """
-        INSERT INTO target_products (
-            product_id, product_name, category_id, 
-            quantity_per_unit, unit_price, units_in_stock, 
-            units_in_order, discontinued, created_by, 
-            modified_by
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        COPY (
+            SELECT
+                product_id, product_name, category_id,
+                quantity_per_unit, unit_price, units_in_stock,
+                units_on_order, discontinued, %s, %s
+            FROM products
+        ) TO STDOUT
         """,
-        insert_values,
-    )
+        (modified_by, modified_by),
+    ).decode()
+    copy_in_sql = """
+        COPY target_products (
+            product_id, product_name, category_id,
+            quantity_per_unit, unit_price, units_in_stock,
+            units_in_order, discontinued, created_by,
+            modified_by
+        ) FROM STDIN
+    """
+    return copy_between(source_cur, target_cur, copy_out_sql, copy_in_sql)
 
 
 def sync_products(source_conn, target_conn, modified_by):
-    """Sync products from source to target"""
+    """Sync products from source to target as a full reload streamed with COPY"""
     try:
         with source_conn.cursor() as source_cur, target_conn.cursor() as target_cur:
-            # Get source and target data
-            source_products = get_source_products(source_cur)
-            logger.debug(f"Found {len(source_products)} products in source database")
+            # Secondary indexes are rebuilt once instead of maintained per row
+            index_definitions = drop_secondary_indexes(target_cur, "target_products")
+            logger.debug(
+                f"Dropped {len(index_definitions)} secondary indexes on target_products"
+            )
 
-            # Clear target table and insert new data
+            # Clear target table and stream the source rows straight into it
             truncate_target_table(target_cur, "target_products")
+            product_count = copy_source_products(source_cur, target_cur, modified_by)
 
-            # Insert products
-            for product in source_products:
-                insert_product(target_cur, product, modified_by)
+            rebuild_indexes(target_cur, index_definitions)
+            analyze_table(target_cur, "target_products")
+            logger.debug("Rebuilt indexes and analyzed target_products")
 
             target_conn.commit()
-            logger.info(
-                f"Products sync completed. {len(source_products)} products synced"
-            )
+            logger.info(f"Products sync completed. {product_count} products synced")
 
     except Exception as e:
         logger.error(f"Error syncing products: {str(e)}")
@@ -218,6 +214,12 @@ def sync_employees(source_conn, target_conn, modified_by):
             # Get all source employees
             source_employees = get_source_employees(source_cur)
 
+            # Secondary indexes are rebuilt once instead of maintained per row
+            index_definitions = drop_secondary_indexes(target_cur, "target_employees")
+            logger.debug(
+                f"Dropped {len(index_definitions)} secondary indexes on target_employees"
+            )
+
             # First pass: Insert all employees with reports_to set to NULL
             for employee in source_employees:
                 employee_id = employee[0]
@@ -245,6 +247,10 @@ def sync_employees(source_conn, target_conn, modified_by):
                     )
                     logger.debug(f"Updated reports_to for employee {employee_id}")
 
+            rebuild_indexes(target_cur, index_definitions)
+            analyze_table(target_cur, "target_employees")
+            logger.debug("Rebuilt indexes and analyzed target_employees")
+
             target_conn.commit()
             logger.info(
                 f"Employees sync completed. {len(source_employees)} employees processed"
@@ -264,6 +270,7 @@ def main():
         # Initialize connections
         source_conn = get_db_connection("source_db")
         target_conn = get_db_connection("target_db")
+        acquire_full_load_lock(target_conn)
 
         logger.info("Starting data sync process")
 
@@ -3,4 +3,4 @@
 source ../../.env
 
 
-docker exec -it ${POSTGRES_ANALYTICS_CONTAINER} psql -d ${POSTGRES_DB_ANALYTICS} -U ${POSTGRES_USER_ANALYTICS} -f /sql/task_03/task_03_schema_ddl.sql
+uv run ../provision.py task_03
\ No newline at end of file
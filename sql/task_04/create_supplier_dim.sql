@@ -20,3 +20,29 @@ CREATE TABLE IF NOT EXISTS supplier_dimension (
     modified_by VARCHAR(50) NOT NULL,
     modified_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
+
+-- At most one current version per supplier, so concurrent syncs can never
+-- leave two current rows behind; also serves the expire UPDATE lookups
+CREATE UNIQUE INDEX IF NOT EXISTS uq_supplier_dimension_current
+ON supplier_dimension (supplier_id)
+WHERE is_current;
+
+-- Runs of the sharded sync. Workers started while a run is unfinished join it
+-- instead of starting a new one
+CREATE TABLE IF NOT EXISTS supplier_sync_run (
+    run_id SERIAL PRIMARY KEY,
+    shard_count SMALLINT NOT NULL,
+    started_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- supplier_id ranges of a run, laid out when the run starts. A worker claims
+-- a bucket by locking its row, and synced_at records that the bucket is done
+CREATE TABLE IF NOT EXISTS supplier_sync_shard (
+    run_id INTEGER NOT NULL REFERENCES supplier_sync_run (run_id),
+    shard SMALLINT NOT NULL,
+    lower_supplier_id INTEGER NOT NULL,
+    upper_supplier_id INTEGER NOT NULL,
+    synced_at TIMESTAMP,
+    PRIMARY KEY (run_id, shard)
+);
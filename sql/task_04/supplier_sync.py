@@ -6,6 +6,21 @@ from datetime import datetime, timezone
 import psycopg2
 from dotenv import load_dotenv
 
+# Shared helpers live one level up, in sql/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from snapshot import SNAPSHOT_ITERSIZE, CompactSnapshot  # noqa: E402
+from supplier_shards import (  # noqa: E402
+    SUPPLIER_ID_MAX,
+    SUPPLIER_ID_MIN,
+    claim_next_shard,
+    finish_run,
+    get_shard_count,
+    get_tracked_columns,
+    mark_shard_synced,
+    start_or_join_run,
+)
+from sync_locks import acquire_full_load_lock  # noqa: E402
+
 
 def setup_logging():
     """Configure logging with file and stream handlers"""
@@ -73,41 +88,42 @@ def get_db_connection(db_name):
         raise
 
 
-def get_tracked_columns():
-    """Return list of columns that need change tracking"""
-    return [
-        "contact_name",
-        "contact_title",
-        "address",
-        "city",
-        "region",
-        "postal_code",
-        "country",
-        "phone",
-    ]
-
-
-def get_source_suppliers(cursor):
-    """Get all suppliers from source database"""
-    cursor.execute("""
+def get_source_suppliers(cursor, lower_id=SUPPLIER_ID_MIN, upper_id=SUPPLIER_ID_MAX):
+    """Get suppliers of one supplier_id range from source database"""
+    cursor.execute(
+        """
         SELECT supplier_id, company_name, contact_name, contact_title,
                address, city, region, postal_code, country, 
                phone, fax, homepage
         FROM suppliers
-    """)
+        WHERE supplier_id BETWEEN %s AND %s
+    """,
+        (lower_id, upper_id),
+    )
     return cursor.fetchall()
 
 
-def get_current_suppliers(cursor):
-    """Get current supplier records from dimension table"""
-    cursor.execute("""
-        SELECT supplier_id, company_name, contact_name, contact_title,
-               address, city, region, postal_code, country, 
-               phone, fax, homepage
-        FROM supplier_dimension
-        WHERE is_current = true
-    """)
-    return {row[0]: row[1:] for row in cursor.fetchall()}
+def get_current_suppliers(cursor, lower_id=SUPPLIER_ID_MIN, upper_id=SUPPLIER_ID_MAX):
+    """Get current supplier records of one supplier_id range from dimension"""
+    # Server-side cursor, so the snapshot is built while the rows stream in
+    with cursor.connection.cursor(name="current_suppliers") as snapshot_cur:
+        snapshot_cur.itersize = SNAPSHOT_ITERSIZE
+        snapshot_cur.execute(
+            """
+            SELECT supplier_id, company_name, contact_name, contact_title,
+                   address, city, region, postal_code, country, 
+                   phone, fax, homepage
+            FROM supplier_dimension
+            WHERE is_current = true
+              AND supplier_id BETWEEN %s AND %s
+            ORDER BY supplier_id
+        """,
+            (lower_id, upper_id),
+        )
+        return CompactSnapshot.from_cursor(
+            snapshot_cur,
+            interned_columns=["contact_title", "city", "region", "country"],
+        )
 
 
 def detect_changes(source_row, target_row, tracked_columns):
@@ -130,88 +146,145 @@ def detect_changes(source_row, target_row, tracked_columns):
     return False
 
 
-def sync_supplier_dimension(source_conn, target_conn, modified_by):
-    """Sync suppliers from source to target using SCD Type 2"""
-    logger = logging.getLogger(__name__)
+def sync_supplier_shard(source_cur, target_cur, shard, shard_range, modified_by):
+    """Apply SCD Type 2 changes for the suppliers of a single bucket.
+
+    The caller must hold the claim of the bucket in the current target
+    transaction. Returns (new_records, updates, unchanged).
+    """
     tracked_columns = get_tracked_columns()
     current_timestamp = datetime.now(timezone.utc)
 
+    # Get source and current target data
+    logger.debug(f"Fetching suppliers of shard {shard} from source database")
+    source_suppliers = get_source_suppliers(source_cur, *shard_range)
+    logger.info(
+        f"Found {len(source_suppliers)} suppliers in source database for shard {shard}"
+    )
+
+    logger.debug(
+        f"Fetching current supplier records of shard {shard} from target database"
+    )
+    current_suppliers = get_current_suppliers(target_cur, *shard_range)
+    logger.info(
+        f"Found {len(current_suppliers)} current supplier records in target database for shard {shard}"
+    )
+
+    # Tracking metrics
+    updates = 0
+    new_records = 0
+    unchanged = 0
+
+    for supplier in source_suppliers:
+        supplier_id = supplier[0]
+        current_record = current_suppliers.get(supplier_id)
+
+        logger.debug(f"Processing supplier_id: {supplier_id}")
+
+        if detect_changes(supplier, current_record, tracked_columns):
+            if current_record:
+                logger.debug(
+                    f"Changes detected for supplier_id: {supplier_id}, expiring current record"
+                )
+                target_cur.execute(
+                    """
+                    UPDATE supplier_dimension
+                    SET end_date = %s,
+                        is_current = false,
+                        modified_by = %s,
+                        modified_at = %s
+                    WHERE supplier_id = %s AND is_current = true
+                    """,
+                    (
+                        current_timestamp,
+                        modified_by,
+                        current_timestamp,
+                        supplier_id,
+                    ),
+                )
+                updates += 1
+            else:
+                logger.debug(f"New supplier detected: {supplier_id}")
+                new_records += 1
+
+            # Insert new record
+            logger.debug(f"Inserting new record for supplier_id: {supplier_id}")
+            target_cur.execute(
+                """
+                INSERT INTO supplier_dimension (
+                    supplier_id, company_name, contact_name, contact_title,
+                    address, city, region, postal_code, country,
+                    phone, fax, homepage, effective_date, end_date,
+                    is_current, created_by, modified_by
+                ) VALUES (
+                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                    %s, NULL, true, %s, %s
+                )
+                """,
+                (*supplier, current_timestamp, modified_by, modified_by),
+            )
+        else:
+            logger.debug(f"No changes detected for supplier_id: {supplier_id}")
+            unchanged += 1
+
+    return new_records, updates, unchanged
+
+
+def sync_supplier_dimension(source_conn, target_conn, modified_by):
+    """Sync suppliers from source to target using SCD Type 2.
+
+    Each run splits the supplier_id space into SUPPLIER_SYNC_SHARDS
+    contiguous ranges, persisted in supplier_sync_shard. Workers started
+    during a run join it and keep claiming buckets nobody has synced yet, each
+    synced in its own target transaction, so every bucket is synced once per
+    run and a worker never touches rows outside the bucket it holds.
+    """
+    shard_count = get_shard_count()
+
     try:
         with source_conn.cursor() as source_cur, target_conn.cursor() as target_cur:
-            logger.info("Starting supplier dimension sync process")
-
-            # Get source and current target data
-            logger.debug("Fetching suppliers from source database")
-            source_suppliers = get_source_suppliers(source_cur)
-            logger.info(f"Found {len(source_suppliers)} suppliers in source database")
+            run_id = start_or_join_run(source_cur, target_conn, shard_count)
 
-            logger.debug("Fetching current supplier records from target database")
-            current_suppliers = get_current_suppliers(target_cur)
             logger.info(
-                f"Found {len(current_suppliers)} current supplier records in target database"
+                f"Starting supplier dimension sync process "
+                f"(run {run_id}, {shard_count} shards)"
             )
 
             # Tracking metrics
             updates = 0
             new_records = 0
             unchanged = 0
-
-            for supplier in source_suppliers:
-                supplier_id = supplier[0]
-                current_record = current_suppliers.get(supplier_id)
-
-                logger.debug(f"Processing supplier_id: {supplier_id}")
-
-                if detect_changes(supplier, current_record, tracked_columns):
-                    if current_record:
-                        logger.debug(
-                            f"Changes detected for supplier_id: {supplier_id}, expiring current record"
-                        )
-                        target_cur.execute(
-                            """
-                            UPDATE supplier_dimension
-                            SET end_date = %s,
-                                is_current = false,
-                                modified_by = %s,
-                                modified_at = %s
-                            WHERE supplier_id = %s AND is_current = true
-                            """,
-                            (
-                                current_timestamp,
-                                modified_by,
-                                current_timestamp,
-                                supplier_id,
-                            ),
-                        )
-                        updates += 1
-                    else:
-                        logger.debug(f"New supplier detected: {supplier_id}")
-                        new_records += 1
-
-                    # Insert new record
-                    logger.debug(f"Inserting new record for supplier_id: {supplier_id}")
-                    target_cur.execute(
-                        """
-                        INSERT INTO supplier_dimension (
-                            supplier_id, company_name, contact_name, contact_title,
-                            address, city, region, postal_code, country,
-                            phone, fax, homepage, effective_date, end_date,
-                            is_current, created_by, modified_by
-                        ) VALUES (
-                            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                            %s, NULL, true, %s, %s
-                        )
-                        """,
-                        (*supplier, current_timestamp, modified_by, modified_by),
-                    )
-                else:
-                    logger.debug(f"No changes detected for supplier_id: {supplier_id}")
-                    unchanged += 1
-
+            synced_shards = 0
+
+            while True:
+                claimed = claim_next_shard(target_cur, run_id)
+                if claimed is None:
+                    target_conn.rollback()
+                    break
+
+                shard, *shard_range = claimed
+                shard_new, shard_updates, shard_unchanged = sync_supplier_shard(
+                    source_cur, target_cur, shard, shard_range, modified_by
+                )
+                mark_shard_synced(target_cur, run_id, shard)
+
+                # Committing also releases the claim of the shard
+                target_conn.commit()
+                logger.debug(f"Shard {shard} committed")
+
+                new_records += shard_new
+                updates += shard_updates
+                unchanged += shard_unchanged
+                synced_shards += 1
+
+            if finish_run(target_cur, run_id):
+                logger.info(f"All shards of run {run_id} are synced")
             target_conn.commit()
+
             logger.info("Supplier dimension sync completed successfully")
             logger.info(
-                f"Summary: {new_records} new suppliers, {updates} updates, {unchanged} unchanged"
+                f"Summary: {new_records} new suppliers, {updates} updates, {unchanged} unchanged, "
+                f"{synced_shards} shards synced by this worker"
             )
 
     except Exception as e:
@@ -233,6 +306,7 @@ def main():
         logger.info("Establishing database connections")
         source_conn = get_db_connection("source_db")
         target_conn = get_db_connection("target_db")
+        acquire_full_load_lock(target_conn)
 
         sync_supplier_dimension(source_conn, target_conn, modified_by)
 
@@ -3,6 +3,6 @@
 source ../../.env
 
 
-docker exec -it ${POSTGRES_ANALYTICS_CONTAINER} psql -d ${POSTGRES_DB_ANALYTICS} -U ${POSTGRES_USER_ANALYTICS} -f /sql/task_04/create_supplier_dim.sql
+uv run ../provision.py task_04
 
 uv run ./supplier_sync.py
@@ -7,6 +7,11 @@ from datetime import datetime
 import psycopg2
 from dotenv import load_dotenv
 
+# Shared helpers live one level up, in sql/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from snapshot import SNAPSHOT_ITERSIZE, CompactSnapshot  # noqa: E402
+
+
 def setup_logging():
     """Configure logging with file and stream handlers"""
     logger = logging.getLogger(__name__)
@@ -73,11 +78,15 @@ def get_db_connection(db_name):
         raise
 
 
-
 def get_existing_supplier_ids(cursor):
-    """Get set of existing supplier IDs"""
-    cursor.execute("SELECT supplier_id FROM imported_supplier")
-    return {row[0] for row in cursor.fetchall()}
+    """Get existing supplier IDs as a key-only snapshot"""
+    # Server-side cursor, so the snapshot is built while the rows stream in
+    with cursor.connection.cursor(name="existing_supplier_ids") as snapshot_cur:
+        snapshot_cur.itersize = SNAPSHOT_ITERSIZE
+        snapshot_cur.execute(
+            "SELECT supplier_id FROM imported_supplier ORDER BY supplier_id"
+        )
+        return CompactSnapshot.from_cursor(snapshot_cur)
 
 
 def import_suppliers(conn, csv_path, modified_by):
@@ -3,7 +3,7 @@
 source ../../.env
 
 # Create the table
-docker exec -it ${POSTGRES_ANALYTICS_CONTAINER} psql -d ${POSTGRES_DB_ANALYTICS} -U ${POSTGRES_USER_ANALYTICS} -f /sql/task_05/create_imported_supplier.sql
+uv run ../provision.py task_05
 
 # Export suppliers from source database to CSV
 docker exec -it ${POSTGRES_SOURCE_CONTAINER} psql -d ${POSTGRES_DB_SOURCE} -U ${POSTGRES_USER_SOURCE} -c "\COPY (SELECT * FROM suppliers) TO '/tmp/suppliers.csv' WITH CSV HEADER"